@@ -64,6 +64,8 @@ class MonitorGUI:
         self.window = None
         self.options_frame = None
         self.logger_frame = None
+        self._ports_drop = None  # COM port drop menu
+        self._peripherals_drop = None  # BLE peripherals drop menu
 
         # init ports
         self.ports_available = serial.tools.list_ports.comports()  # list of available ports
@@ -87,9 +89,9 @@ class MonitorGUI:
 
     def create_root_widgets(self):
         # drop down menu of available Arduino ports
-        drop = tk.OptionMenu(self.root, self.port, *self.ports_available)
-        drop.grid(row=0, column=0)
-        drop.config(width=40)
+        self._ports_drop = tk.OptionMenu(self.root, self.port, *self.ports_available)
+        self._ports_drop.grid(row=0, column=0)
+        self._ports_drop.config(width=40)
         self.port.trace('r', self.refresh_ports)  # refresh ports each time drop menu is clicked
 
         # button to select the chosen option
@@ -98,9 +100,7 @@ class MonitorGUI:
 
     def refresh_ports(self, *args):
         self.ports_available = serial.tools.list_ports.comports()
-        drop = tk.OptionMenu(self.root, self.port, *self.ports_available)
-        drop.grid(row=0, column=0)
-        drop.config(width=40)
+        set_menu_options(self._ports_drop, self.port, self.ports_available)
 
     def select_monitor(self):
         if self.port.get() == "Select COM Port":
@@ -170,10 +170,10 @@ class MonitorGUI:
             lbl.grid(row=0, column=2, sticky='W')
             # BLE peripheral selection drop menu
             self.peripheral.set("Select Peripheral")
-            peripherals = self.update_peripherals()
-            drop = tk.OptionMenu(self.options_frame, self.peripheral, *peripherals)
-            drop.grid(row=1, column=2)
-            drop.config(width=40)
+            self._peripherals_drop = tk.OptionMenu(self.options_frame, self.peripheral, "Select Peripheral")
+            self._peripherals_drop.grid(row=1, column=2)
+            self._peripherals_drop.config(width=40)
+            self.update_peripherals()
             self.peripheral.trace('r', self.update_peripherals)  # refresh peripherals each time drop menu is clicked
             # BLE Connect to the Peripheral
             connect_btn = tk.Button(self.options_frame, text="Connect", command=self.connect_to_peripheral)
@@ -191,6 +191,7 @@ class MonitorGUI:
         self.logger_frame.grid(row=1, column=3)
 
     def close_window(self):
+        self.monitor.force_flush()  # make sure all logged rows are written before closing
         if self.monitor.ble:
             self.monitor.ble_disconnect()
         self.monitor.stop_logger()
@@ -216,16 +217,12 @@ class MonitorGUI:
             # ble monitor central has no peripherals
             self.peripheral.set("No Peripherals Found, Scanning...")
             peripherals = ["No Peripherals Found, Scanning..."]
-            return peripherals
-
-        if self.peripheral.get() == "No Peripherals Found, Scanning...":
+        elif self.peripheral.get() == "No Peripherals Found, Scanning...":
             # peripherals found, change default drop menu selection
             self.peripheral.set("Select Peripheral")
 
         # update the drop menu
-        drop = tk.OptionMenu(self.options_frame, self.peripheral, *peripherals)
-        drop.grid(row=1, column=2)
-        drop.config(width=40)
+        set_menu_options(self._peripherals_drop, self.peripheral, peripherals)
         return peripherals
 
     def connect_to_peripheral(self):
@@ -237,16 +234,23 @@ class MonitorGUI:
         # start connecting to ble in the background
         self.status_label.destroy()
         self.status_label = status_bar(self.window, f"Connecting to {self.peripheral.get()}")
+        self.monitor._connect_done.clear()  # don't wake up on a previous connection attempt
         ble_connect_thread = threading.Thread(name='connecting_loop',
                                               target=lambda: self.monitor.ble_connect(self.peripheral.get()))
         ble_connect_thread.start()
 
+        def update_status(status):
+            self.status_label.destroy()
+            self.status_label = status_bar(self.window, status)
+
         def check_connected():
-            while True:
-                if self.monitor.ble_connected:
-                    self.status_label.destroy()
-                    self.status_label = status_bar(self.window, f"BLE Connected to {self.peripheral.get()}")
-                    break
+            # sleep until ble_connect finishes instead of polling the monitor, it always reports an outcome
+            self.monitor._connect_done.wait()
+            if self.monitor.ble_connected:
+                status = f"BLE Connected to {self.peripheral.get()}"
+            else:
+                status = f"Could not connect to {self.peripheral.get()}"
+            self.window.after(0, update_status, status)  # tkinter widgets are updated from the main thread
         check_connected_thread = threading.Thread(name='check_connection_loop', target=check_connected)
         check_connected_thread.start()
 
@@ -257,6 +261,8 @@ Module Functions
 Function                     Description
 ======================       ========================================================================
 status_bar                   Generates a status label
+
+set_menu_options             Replaces the options of an existing tk.OptionMenu in place
 """
 
 
@@ -266,6 +272,14 @@ def status_bar(window, status):
     return status_label
 
 
+def set_menu_options(drop, variable, options):
+    # reuse the existing menu instead of building a new tk.OptionMenu widget
+    menu = drop['menu']
+    menu.delete(0, 'end')
+    for option in options:
+        menu.add_command(label=option, command=tk._setit(variable, option))
+
+
 def main():
     # Create the GUI program
     program = MonitorGUI(title="Python Logger", initial_dir='C:/Users/McGoverJ/OneDrive - Coherent, Inc/'
@@ -31,17 +31,23 @@ device_name                  BLE advertised local name, also used in making tsv
 
 comport                      Selected port of the wired logger/ BLE central
 
-start                        Keyword to represent if logger is active.
+start                        True while the logger is active (read-only, backed by a stop event).
 
 ser                          pyserial <serial.Serial> object for a given COM port
 
 sensors                      Available sensors for the wired device/ connected BLE peripheral
 
 ble_connected                True if a ble central is connected to the device, False otherwise
+
+flush_interval               Max seconds logged rows are kept in memory before being written to the
+                             log file. Default 1.0
+
+realtime                     If True the serial reader thread is pinned to one CPU and given a
+                             real-time/ time critical priority where allowed. Default False
 ======================       ========================================================================
 Method                       Description
 ======================       ========================================================================
-open_port                    Opens the serial port
+open_port                    Opens the serial port (in low latency mode where supported)
 
 close_port                   Closes the serial port
 
@@ -50,32 +56,45 @@ restart_port                 Restarts the serial port (close then open)
 log_to_directory             Starts tsv data logging to user specified <path>. Makes a new directory
                              for a new device_name and a new file each day.
                              E.g. 'path/device_name/YYYY-MM-DD.txt'
-                             loop runs in background thread <log_loop>
+                             serial port is drained by background thread <read_loop>, lines are
+                             parsed and written by background thread <log_loop>
+
+start_logger                 Starts logging to specified path. Does nothing if already logging or
+                             the sensors are unknown (sensors is None)
 
-start_logger                 Sets start keyword to True and starts logging to specified path
+stop_logger                  Sets the stop event and stops logging
 
-stop_logger                  Sets start keyword to False and stops logging
+force_flush                  Writes all buffered rows to the log file. Rows are buffered in memory
+                             and only flushed in batches: every 64 rows (or 8 KiB), when rows are
+                             waiting and flush_interval seconds have passed since the last write
+                             (checked whenever the logger thread wakes up), on a new day and when
+                             the logger stops. An unexpected crash can lose the rows since the
+                             last flush.
 
 ble_scan                     Scan for n_peripherals available peripherals. Returns a list of
                              peripherals found. Return [None] if device is not a BLE central.
 
 ble_connect                  Connect to specified available BLE peripheral. Updates device_name to
-                             become the same as the peripheral
+                             become the same as the peripheral. ble_connected is True afterwards
+                             if the connection succeeded, False otherwise
 
 ble_disconnect               Disconnects from BLE by restarting BLE central device.
 """
 
 import serial  # https://pyserial.readthedocs.io/en/latest/
-from pathlib import Path
-from datetime import date, datetime
-from os import mkdir
+from datetime import date, datetime, timedelta
+import os
+from collections import deque
+from functools import lru_cache
 import threading
+import queue
 import time
+import sys
 
 
 class EnvironmentMonitor:
 
-    def __init__(self, comport, baud_rate=9600, delimiter='tsv'):
+    def __init__(self, comport, baud_rate=9600, delimiter='tsv', flush_interval=1.0, realtime=False):
 
         # setup pyserial port object
         self.comport = comport
@@ -84,13 +103,31 @@ class EnvironmentMonitor:
 
         # init variables
         self.delimiter = delimiter
-
-        self.start = False  # logger status (stopped by default)
-        self.timestamp = None  # logger timestamp
+        self.flush_interval = flush_interval  # seconds between writes of the buffered rows
+        self.realtime = realtime  # pin the serial reader thread to one CPU at a raised priority
+
+        self._stop_evt = threading.Event()  # set when the logger is stopped, a new one for each session
+        self._stop_evt.set()  # logger stopped by default
+        self._log_thread = None  # logger thread of the current session
+        self._read_thread = None  # serial reader thread of the current session
+        self._timestamp = None  # logger timestamp as written to the file (bytes)
         self.path = None  # logger logger files path
         self.peripherals = [None]  # list of available ble peripherals
-        self.timestamp = None  # logger timestamp
         self.current_data = [None]  # logger data-list
+        self._rx_ready = threading.Event()  # wakes the logger thread: new bytes queued or session ended
+        self._log_fd = None  # file descriptor of the open log file
+        self._next_rollover = 0.0  # time.time() of the next midnight, when a new file is started
+        self._date_prefix = None  # date part of the logger timestamps, 'YYYY-MM-DD '
+        self._second = None  # whole second of the last timestamp
+        self._second_prefix = None  # timestamp up to the whole second, b'YYYY-MM-DD HH:MM:SS'
+        self._log_lock = threading.Lock()  # guards the log file between the logger thread and stop_logger
+        self._write_buf = bytearray()  # rows waiting to be written to the log file
+        self._buffered_samples = 0  # number of rows in _write_buf
+        self._flush_every = 64  # write the buffered rows to the file every n samples
+        self._last_flush = time.monotonic()  # when the buffered rows were last written
+        self._connected_event = threading.Event()  # set while a BLE peripheral is connected
+        self._connect_done = threading.Event()  # set when a ble_connect attempt ends, ble_connected is the outcome
+        self._rx_leftover = b''  # bytes read past the sensor names by get_sensors, the next session starts with them
 
         # get device info and check if device is an Arduino
         self.ble, self.device_name = monitor_validate(self.ser)  # device_name is None if device is a BLE central
@@ -102,7 +139,7 @@ class EnvironmentMonitor:
         else:
             # device is a BLE peripheral wired directly to the PC
             self.ble_connected = None
-            self.sensors = get_sensors(self.ser, self.device_name)  # update sensor names
+            self.sensors, self._rx_leftover = get_sensors(self.ser, self.device_name)  # update sensor names
 
     # close the COM port
     def close_port(self):
@@ -111,6 +148,8 @@ class EnvironmentMonitor:
     # open the COM port
     def open_port(self):
         self.ser.open()
+        self._rx_leftover = b''  # received before the port was reopened
+        set_low_latency(self.ser)
 
     # restart the COM port
     def restart_port(self):
@@ -118,108 +157,296 @@ class EnvironmentMonitor:
         time.sleep(1)
         self.open_port()
 
+    # True while the logger is running
+    @property
+    def start(self):
+        return not self._stop_evt.is_set()
+
+    # timestamp of the last logged sample, only decoded when asked for
+    @property
+    def timestamp(self):
+        return None if self._timestamp is None else self._timestamp.decode('ascii')
+
+    # sensor names of the device
+    @property
+    def sensors(self):
+        return self._sensors
+
+    # the log file header rows only change with the sensors, so they are built here and not by the logger
+    @sensors.setter
+    def sensors(self, sensors):
+        self._sensors = sensors
+        if sensors is None:
+            self._sensor_names = ()
+            self._header_line_tsv = self._header_line_csv = None
+        else:
+            self._sensor_names = tuple(sensors)
+            self._header_line_tsv = ('timestamp\t' + '\t'.join(sensors) + '\n').encode()
+            self._header_line_csv = ('timestamp,' + ','.join(sensors) + '\n').encode()
+
+    # end the current logger session and wake up its threads
+    def _end_session(self):
+        self._stop_evt.set()
+        self._rx_ready.set()  # the logger thread sleeps until it is woken
+
+    # wait for the session's threads to finish, so nothing else reads the port or writes the file
+    def _join_session(self):
+        for thread in (self._read_thread, self._log_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=1)  # reader stops within a millisecond, logger finishes its sample
+
     # connect to the wired device
     def write_device_name(self, device_name):
-        self.start = False  # make sure logger has stopped
+        # make sure logger has stopped, the next session logs to the new device's directory.
+        # the reader has to be finished before the port is written to or its timeout changed
+        self._end_session()
+        self._join_session()
+        with self._log_lock:
+            self._close_log_file()
 
         device_name = device_name[0:8]  # dos 8.3 filename format for the SD card. 8 chars max
         self.device_name = device_name  # update new name
         write_device_name(self.ser, self.device_name)  # write to Serial
 
         self.ser.flushInput()  # allow device to update the name
-        self.sensors = get_sensors(self.ser, self.device_name)  # update sensor names
+        self._rx_leftover = b''  # from the old name, dropped like the port's input
+        self.sensors = None  # unknown until the device sends them, the logger won't start without them
+        if not self.ble:
+            # a BLE central is connecting to the peripheral, ble_connect reads the sensors once connected
+            self.sensors, self._rx_leftover = get_sensors(self.ser, self.device_name)  # update sensor names
 
     # log monitor sensors data to a tsv .txt
     def log_to_directory(self, path):
         self.path = path
-        # check if directory exists
+        # make the directory if it doesn't exist yet
         directory = f"{path}/{self.device_name}"
-        if not Path(directory).exists():
-            mkdir(directory)  # make new directory
-
-        # logging loop thread in the background
-        def log_loop():
+        os.makedirs(directory, exist_ok=True)
+
+        if not self.start or (self._log_thread is not None and self._log_thread.is_alive()):
+            # logger threads are started by start_logger, and never twice for the same session
+            return
+        if self.sensors is None:
+            # no header row or sensor names to log with, end the session before any thread starts
+            self._end_session()
+            return
+
+        # the threads keep this session's events and buffers, so threads of an older session can never
+        # resume or mix their bytes into this one
+        stop_evt = self._stop_evt
+        rx_ready = self._rx_ready = threading.Event()
+        rx_chunks = deque()  # serial bytes handed from the reader thread to the logger thread
+        # serial bytes received but not yet split into lines, starting with anything get_sensors read past
+        # the sensor names (the port carries on from there)
+        rx_buf = bytearray(self._rx_leftover)
+        self._rx_leftover = b''
+
+        # serial reader thread in the background. Only drains the port so a slow disk or console
+        # never holds up reading and overflows the serial buffer
+        def read_loop():
             ser = self.ser
-            while self.start:
-                # filename is the selected directory/device name/today's date
+            timeout = ser.timeout
+            ser.timeout = 0  # non-blocking, so stop_logger takes effect within a millisecond
+            if self.realtime:
+                set_realtime()
+            try:
+                while not stop_evt.is_set():
+                    try:
+                        # read everything waiting on the port in one call
+                        chunk = ser.read(max(1, ser.in_waiting))
+                    except (serial.SerialException, OSError):
+                        # port was closed underneath the reader (e.g. by ble_disconnect) or the device unplugged
+                        if not stop_evt.is_set():
+                            self.stop_logger()  # end the session, the logger thread is waiting on the reader
+                        break
+                    if chunk:
+                        # deque append/popleft are atomic, no lock needed with one reader and one writer
+                        rx_chunks.append(chunk)
+                        rx_ready.set()
+                    else:
+                        stop_evt.wait(0.001)  # nothing received yet
+            finally:
+                ser.timeout = timeout  # the other commands read with a blocking timeout
+
+        # logging loop thread in the background, parses the received lines and writes them to file
+        def log_loop():
+            try:
+                device_name = self.device_name.encode()  # same bytes as written to the device
+                # delimiter is fixed for the session
                 if self.delimiter == 'csv':
                     separator = ','
-                    filename = f"{directory}/{date.today()}.csv"
+                    extension = 'csv'
+                    header_line = self._header_line_csv
                 else:
                     separator = '\t'
-                    filename = f"{directory}/{date.today()}.txt"
-
-                # write headers if a new file
-                if not Path(filename).exists():
-                    headers = separator.join(self.sensors)
-                    # write headers as first line if a new file
-                    file = open(filename, 'w')
-                    file.write(f"timestamp{separator}")
-                    file.write(f"{headers}\n")
-                    file.close()
-
-                line = ser.readline().decode().strip('\r\n')
-
-                # checks for BLE events
-                if self.ble:
-                    if line.split()[0] == "Found":
-                        # connection failed, stop logging
-                        self.ble_connected = False
-                        print("Could not connect")
-                        self.stop_logger()
-                        break
-                    elif line == "Peripheral disconnected." or line == "Rescanning for UUID":
-                        # disconnected, stop logging
-                        self.ble_connected = False
-                        print(f"Disconnected from {self.device_name}")
-                        self.stop_logger()
-                        break
-
-                # make sure line read is the sensor data and not headers
-                if self.device_name in line.split('\t')[0]:
-                    line = ser.readline().decode().strip('\r\n')
-
-                ser.readline()  # flush out extra line (sensor names)
-
-                # sensors data
-                self.timestamp = str(datetime.now())  # current timestamp
-                sensors_data_list = line.split('\t')
-                self.current_data = [float(sensor_data) for sensor_data in sensors_data_list]
-                if self.delimiter == 'csv':
-                    file_data = ','.join(sensors_data_list)
-                else:
-                    file_data = line
-                # failsafe for an error when reading the data
-                if 0.00 in self.current_data:
-                    self.ble_disconnect()
+                    extension = 'txt'
+                    header_line = self._header_line_tsv
+                separator_bytes = separator.encode()
+                # the session can start in the middle of a line, nothing is logged until the first header
+                synced = False
+
+                while not stop_evt.is_set():
+                    # sleep until the reader thread receives something or the session ends, or until
+                    # the buffered rows are due to be written if the device goes quiet
+                    wait_timeout = None
+                    if self._buffered_samples:
+                        wait_timeout = max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+                    rx_ready.wait(wait_timeout)
+                    rx_ready.clear()
+                    while rx_chunks:
+                        rx_buf.extend(rx_chunks.popleft())
+                    if b'\n' in rx_buf:
+                        # split off all complete lines, keep the partial tail for the next read
+                        *lines, partial = rx_buf.split(b'\n')
+                        rx_buf[:] = partial
+                    else:
+                        lines = ()  # no complete line yet, buffered rows may still be due
+
+                    for raw in lines:
+                        # lines stay bytes, they are only decoded for the terminal
+                        line = raw.rstrip(b'\r')
+                        if not line:
+                            continue
+                        parts = line.split(b'\t')
+
+                        # checks for BLE events
+                        if self.ble:
+                            if line.startswith(b"Found "):
+                                # connection failed, stop logging
+                                self.ble_connected = False
+                                self._connected_event.clear()
+                                queue_print("Could not connect\n")
+                                self.stop_logger()
+                                return
+                            elif line == b"Peripheral disconnected." or line == b"Rescanning for UUID":
+                                # disconnected, stop logging
+                                self.ble_connected = False
+                                self._connected_event.clear()
+                                queue_print(f"Disconnected from {self.device_name}\n")
+                                self.stop_logger()
+                                return
+
+                        # skip the device name and sensor names lines, only the sensor data is logged
+                        if device_name in parts[0]:
+                            synced = True
+                            continue
+                        if not synced:
+                            continue  # could be the tail of a line sent before the logger started
+
+                        # sensors data
+                        now = time.time()  # current timestamp, formatted once the log file for the day is known
+                        sensors_data_list = parts
+                        # float() parses the bytes directly, map keeps the loop in C
+                        self.current_data = list(map(float, sensors_data_list))
+                        if self.delimiter == 'csv':
+                            file_data = b','.join(sensors_data_list)
+                        else:
+                            file_data = line  # already tab separated, written as received
+                        # failsafe for an error when reading the data. Zero is sent as '0.00', so one byte
+                        # search of the raw line rules out most samples before the floats are compared
+                        if b'0.0' in line and 0.00 in self.current_data:
+                            self.ble_disconnect()
+                            self.stop_logger()
+                            raise BLEDataError("0.00 found in ser.readline. Restart Device.")
+
+                        # write to the file, kept open between samples
+                        with self._log_lock:
+                            if stop_evt.is_set():
+                                return  # logger was stopped (and the file closed) from another thread
+                            if now >= self._next_rollover:
+                                # new day (or first sample), switch to the new file
+                                self._close_log_file()
+                                today = date.fromtimestamp(now)
+                                # filename is the selected directory/device name/today's date
+                                filename = log_filename(today.toordinal(), directory, extension)
+                                self._log_fd = os.open(filename, LOG_FILE_FLAGS, 0o644)
+                                self._date_prefix = f"{today.isoformat()} "
+                                self._second = None
+                                # until midnight only a float compare is needed to check the date
+                                self._next_rollover = datetime.combine(today + timedelta(days=1),
+                                                                       datetime.min.time()).timestamp()
+                                if os.fstat(self._log_fd).st_size == 0:
+                                    # write headers as first line if a new (or empty) file
+                                    self._write_buf += header_line
+                            # same format as str(datetime.now()), without building a datetime for every sample.
+                            # HH:MM:SS is only formatted again once the second changes
+                            second = int(now)
+                            if second != self._second:
+                                self._second = second
+                                self._second_prefix = (f"{self._date_prefix}"
+                                                       f"{time.strftime('%H:%M:%S', time.localtime(second))}").encode()
+                            self._timestamp = timestamp = b'%s.%06d' % (self._second_prefix, int(now % 1 * 1e6))
+                            # each row is built in one piece and appended to the reused write buffer,
+                            # which is written in batches
+                            self._write_buf += b'%s%s%s\n' % (timestamp, separator_bytes, file_data)
+                            self._buffered_samples += 1
+
+                        # print data to terminal, formatted by the printer thread
+                        queue_print((self._timestamp, self._sensor_names, sensors_data_list))
+
+                    # checked on every wakeup. Every sample received in this wakeup is buffered by now,
+                    # so a backlog goes out in one write
+                    with self._log_lock:
+                        if self._buffered_samples and (
+                                self._buffered_samples >= self._flush_every or len(self._write_buf) >= 8192
+                                or time.monotonic() - self._last_flush >= self.flush_interval):
+                            self._flush_write_buf()
+            finally:
+                if not stop_evt.is_set():
+                    # loop ended on an error, stop the session so the log file is written and closed
                     self.stop_logger()
-                    raise BLEDataError("0.00 found in ser.readline. Restart Device.")
-
-                # write to the file
-                file = open(filename, 'a+')
-                file.write(f'{self.timestamp}{separator}')
-                file.write(f"{file_data}\n")
-                file.close()
 
-                # print data to terminal
-                print(f'\n{self.timestamp}')
-                for i in range(len(self.sensors)):
-                    print(f'{self.sensors[i]}: {sensors_data_list[i]}')
-
-        # run loop as a thread in the background
-        log_loop_thread = threading.Thread(name='log_loop', target=log_loop)
-        log_loop_thread.start()
+        # run loops as threads in the background
+        self._read_thread = threading.Thread(name='read_loop', target=read_loop)
+        self._read_thread.start()
+        self._log_thread = threading.Thread(name='log_loop', target=log_loop)
+        self._log_thread.start()
+
+    # write the buffered rows to the log file in one call. Caller must hold _log_lock
+    # (not memory mapped on purpose: a preallocated file would show zero padding to anyone
+    # opening the day's log while logging, and is left padded if the program crashes)
+    def _flush_write_buf(self):
+        if self._write_buf and self._log_fd is not None:
+            # straight to the OS, no fsync, the OS decides when it reaches the disk
+            written = os.write(self._log_fd, self._write_buf)
+            while written < len(self._write_buf):
+                written += os.write(self._log_fd, self._write_buf[written:])  # partial write
+        self._write_buf.clear()
+        self._buffered_samples = 0
+        self._last_flush = time.monotonic()
+
+    # write any buffered rows and close the open log file. Caller must hold _log_lock
+    def _close_log_file(self):
+        self._flush_write_buf()
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+        self._log_fd = None
+        self._next_rollover = 0.0  # open a new file on the next sample
+
+    # push all buffered rows through to the log file (called on rollover, stop and window close)
+    def force_flush(self):
+        with self._log_lock:
+            self._flush_write_buf()
 
     # start logger
     def stop_logger(self):
         self.current_data = [None]  # logger stopped, no data available
-        self.start = False
-        print('logger stopped')
+        self._end_session()
+        self._join_session()
+        with self._log_lock:
+            self._close_log_file()  # writes the buffered rows first
+        queue_print('logger stopped\n')  # same queue as the samples, so it's printed after them
 
     # stop logger
     def start_logger(self):
-        self.start = True
-        print("\nlogger started\n")
+        if self.start:
+            return  # already logging
+        if self.sensors is None:
+            # BLE peripheral not connected, or the sensor names were never received
+            queue_print("logger not started, sensors unknown\n")
+            return
+        self._stop_evt = threading.Event()  # new session
+        self._log_thread = self._read_thread = None
+        queue_print("\nlogger started\n\n")
         self.log_to_directory(self.path)
 
     # scan for ble peripherals advertising with monitor service
@@ -228,32 +455,45 @@ class EnvironmentMonitor:
             # device is not a BLE central, can't scan
             return None
         else:
+            self._rx_leftover = b''  # the scan reads on from the port, so it no longer follows on
             self.peripherals = ble_scan(self.ser, n_peripherals)
             return self.peripherals
 
     # connect to specific peripheral (use threading if using method for a GUI)
     def ble_connect(self, peripheral):
         self.device_name = peripheral
-        print(f"Connecting to {peripheral} ...")
+        self.ble_connected = False
+        self._connected_event.clear()
+        self._connect_done.clear()
+        queue_print(f"Connecting to {peripheral} ...\n")
         ser = self.ser
-        self.write_device_name(self.device_name)
-        ser.readline().decode().strip('\r\n')
-        ser.timeout = 20  # increase timeout to allow for device to connect
-
-        # flush out the connected prints
-        ser.readline()  # connected
-        ser.readline()  # discovering attributes
-        ser.readline()  # attributes discovered
-        ser.readline()   # subscribed
-        self.sensors = get_sensors(ser, peripheral)
-        print("Connected.")
-        self.ble_connected = True
+        try:
+            self.write_device_name(self.device_name)
+            read_line(ser)
+            ser.timeout = 20  # increase timeout to allow for device to connect
+
+            # flush out the connected prints
+            read_line(ser)  # connected
+            read_line(ser)  # discovering attributes
+            read_line(ser)  # attributes discovered
+            read_line(ser)   # subscribed
+            try:
+                self.sensors, self._rx_leftover = get_sensors(ser, peripheral, timeout=20)
+            except ArduinoNotFoundError:
+                queue_print(f"Could not connect to {peripheral}\n")  # sensor names never arrived
+                return
+            queue_print("Connected.\n")
+            self.ble_connected = True
+            self._connected_event.set()  # set while connected
+        finally:
+            self._connect_done.set()  # wake up anything waiting on the attempt, connected or not
 
     # restart the Serial port and device starts scanning for peripherals again
     def ble_disconnect(self):
         self.stop_logger()
         self.restart_port()
         self.ble_connected = False
+        self._connected_event.clear()
 
 
 """
@@ -269,12 +509,38 @@ write_device_name            Write 8 byte ASCII to the connected Arduino represe
 get_sensors                  Get the names of the sensors corresponding to the logger connected via
                              serial or the sensors of the BLE peripheral connected to the BLE Central
                              by BLE that is connected to the script via serial.
+                             Also returns the bytes received after the sensor names line, so they
+                             aren't lost. Throws exception if the sensor names are not received
+                             within timeout seconds. Default 3
                              
 ble_scan                     Scan available peripherals and return a list of available BLE loggers.
                              Scans for n_peripherals. Default value is 5.
+
+set_low_latency              Stop the USB serial driver holding back received bytes (Linux only)
+
+queue_print                  Queue text or a (timestamp, sensors, data) sample for the terminal.
+                             Written by background thread <print_loop> so a slow console never
+                             delays logging. Dropped if the console can't keep up.
+
+read_line                    Read one line (at most MAX_LINE_LENGTH bytes) from the serial port as
+                             bytes without the line ending
+
+set_realtime                 Pin the calling thread to one CPU and raise its priority (SCHED_FIFO on
+                             Linux if privileged, time critical on Windows). Best effort only
+
+log_filename                 Path of the log file for a day (date ordinal), cached so restarting
+                             the logger or a new day doesn't format it again
 """
 
 
+# log files are appended to with raw os.write calls (binary on Windows, so no newline translation)
+LOG_FILE_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+
+
+# longest line the Arduino sends (device name, sensor names or sensor data)
+MAX_LINE_LENGTH = 256
+
+
 # custom exception
 class ArduinoNotFoundError(ValueError):
     pass
@@ -284,22 +550,56 @@ class BLEDataError(ValueError):
     pass
 
 
+# USB serial adapters (e.g. FTDI) hold received bytes back for up to 16 ms by default.
+# Linux only, pyserial sets ASYNC_LOW_LATENCY on the port. On Windows the logger's non-blocking
+# reads (timeout=0) already make pyserial set the equivalent SetCommTimeouts
+def set_low_latency(ser):
+    try:
+        ser.set_low_latency_mode(True)
+    except (AttributeError, NotImplementedError, ValueError):
+        pass  # platform or driver doesn't support it, keep the default
+
+
+# less scheduler jitter for the calling thread. Anything the platform or user isn't allowed is skipped
+def set_realtime(cpu=0):
+    if sys.platform == 'win32':
+        import ctypes
+        THREAD_PRIORITY_TIME_CRITICAL = 15
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+        return
+    try:
+        os.sched_setaffinity(0, {cpu})  # 0 is the calling thread on Linux
+    except (AttributeError, OSError):
+        pass  # not Linux or no such CPU
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO)))
+    except (AttributeError, OSError):
+        pass  # not Linux or not privileged (needs root/ CAP_SYS_NICE)
+
+
+# read one line from the serial port as bytes without the line ending, decoded only where needed
+def read_line(ser):
+    # bounded, a missing line ending can't keep the read going past the longest expected line
+    return ser.read_until(b'\n', MAX_LINE_LENGTH).rstrip(b'\r\n')
+
+
 # get details on the device, check if device is an Arduino monitor
 def monitor_validate(ser):
     # how long to wait on readline before throwing an error. if error keeps popping up, increase this value
     ser.timeout = 2
-    line = ser.readline().decode().strip('\r\n')
-    if line == 'BLE Central':
+    line = read_line(ser)
+    if line == b'BLE Central':
         # device is a central, set ble to True
         is_ble = True
         device_name = None  # need to connect ble first to get peripheral device name
-    elif line == '':
+    elif line == b'':
         # ser.readline timeout, throw an error
         raise ArduinoNotFoundError(f"Arduino Environment Monitor not found on {ser.port} (serial read timeout).")
     else:
         # must be a wired Arduino
         is_ble = False
-        device_name = line
+        device_name = line.decode('utf-8', 'replace')
     return is_ble, device_name
 
 
@@ -308,34 +608,79 @@ def write_device_name(ser, device_name):
     ser.write(device_name.encode())
 
 
-# get the available sensors
-def get_sensors(ser, device_name):
-    ser.timeout = 3
-    ser.readline()
-    line = ser.readline().decode().strip('\r\n')
-    # make sure headers are read
-    if device_name not in line.split('\t')[0]:
-        ser.readline()  # skip device_name
-        line = ser.readline().decode().strip('\r\n')  # sensor names
-
-    if len(line.split('\t')) == 1:
-        line = ser.readline().decode().strip('\r\n')  # sensor names
-    sensors = line.split('\t')
-    # get list of sensors from line
-    for i, sensor in enumerate(sensors):
-        sensors[i] = sensor.replace('\t', '')
-    return sensors
+# get the available sensors, and the bytes received after the sensor names line
+def get_sensors(ser, device_name, timeout=3):
+    name = device_name.encode()  # same bytes as written to the device
+    deadline = time.monotonic() + timeout  # one timeout for the whole search, not one per line
+    ser_timeout = ser.timeout
+    received = bytearray()
+    start = 0  # first received line not checked yet
+    try:
+        while True:
+            # sensor names line is the tab separated line starting with the device name
+            end = received.find(b'\n', start)
+            while end != -1:
+                sensors = received[start:end].rstrip(b'\r').split(b'\t')
+                if len(sensors) > 1 and name in sensors[0]:
+                    # split already removed the delimiters, the names only need decoding
+                    return [sensor.decode('utf-8', 'replace') for sensor in sensors], bytes(received[end + 1:])
+                start = end + 1
+                end = received.find(b'\n', start)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ArduinoNotFoundError(f"Sensor names not received from {ser.port} (serial read timeout).")
+            ser.timeout = remaining
+            # everything the device has sent so far in one read (waits for the first byte if nothing is waiting)
+            received += ser.read(max(1, ser.in_waiting))
+    finally:
+        ser.timeout = ser_timeout
 
 
 # scan for n peripherals
 def ble_scan(ser, n):
-    ser.readline()
+    read_line(ser)
     ser.timeout = 10  # change timeout to allow device to snap for peripheral
-    peripheral_list = []
+    peripheral_list = []  # peripherals in the order they were found
+    seen = set()  # for constant time duplicate checks
     for i in range(n):
-        line = ser.readline().decode().strip('\r\n')
-        peripheral_discovered = line.split()[-1]
-        if peripheral_discovered not in peripheral_list:
+        line = read_line(ser)
+        peripheral_discovered = line.split()[-1].decode('utf-8', 'replace')
+        if peripheral_discovered not in seen:
+            seen.add(peripheral_discovered)
             peripheral_list.append(peripheral_discovered)
     return peripheral_list
   
+
+
+# log file path for a day, e.g. 'path/device_name/YYYY-MM-DD.txt'. Keyed on date.toordinal()
+@lru_cache(maxsize=4)
+def log_filename(day_ordinal, directory, extension):
+    return f"{directory}/{date.fromordinal(day_ordinal).isoformat()}.{extension}"
+
+
+# format a logged sample for the terminal
+def format_sample(timestamp, sensors, data):
+    lines = '\n'.join(f'{name}: {value.decode("ascii", "replace")}' for name, value in zip(sensors, data))
+    return f'\n{timestamp.decode("ascii")}\n{lines}\n'
+
+
+# queue text or a (timestamp, sensors, data) sample for the terminal
+def queue_print(item):
+    try:
+        print_queue.put_nowait(item)
+    except queue.Full:
+        pass  # console can't keep up, drop it rather than delay the logger
+
+
+# background thread writing everything queued so far to the terminal in one go
+def print_loop():
+    while True:
+        items = [print_queue.get()]
+        while not print_queue.empty():
+            items.append(print_queue.get_nowait())
+        sys.stdout.write(''.join(item if isinstance(item, str) else format_sample(*item) for item in items))
+
+
+# terminal output of every monitor goes through one printer thread
+print_queue = queue.Queue(maxsize=64)
+threading.Thread(name='print_loop', target=print_loop, daemon=True).start()